@@ -3,9 +3,23 @@ from tkinter import ttk, filedialog, messagebox
 import os
 import sys  # For sys.exit() in the dependency checker and perform_dependency_check
 import threading
+import traceback
 import io
 import webbrowser
 import re
+import stat
+import tempfile
+import math
+import multiprocessing
+import concurrent.futures
+import itertools
+import collections
+import functools
+import importlib.util
+import hashlib
+import mmap
+import contextlib
+import gc
 
 # --- Configuration ---
 # If poppler is not in your PATH, specify the path to the bin directory here
@@ -13,6 +27,35 @@ import re
 # Example for Linux/macOS (if installed but not found): POPPLER_PATH = "/usr/local/bin" or similar
 POPPLER_PATH = None  # Set this if needed, otherwise leave as None
 
+# If PyMuPDF is installed (pip install pymupdf), pages are rendered in-process by
+# MuPDF instead of through Poppler. Set to False to always use pdf2image/Poppler.
+USE_PYMUPDF = True
+# If pikepdf is installed (pip install pikepdf), splitting to PDFs and merging use
+# qpdf instead of pypdf. Set to False to always use pypdf.
+USE_PIKEPDF = True
+# If img2pdf is installed (pip install img2pdf), images being merged are wrapped into
+# the PDF as they are (JPEGs are not decoded or re-compressed) instead of through
+# Pillow. Set to False to always convert them with Pillow.
+USE_IMG2PDF = True
+IMAGE_DPI = 150  # Default resolution for rendering pages to images; pixels (and time/memory) grow with DPI squared
+MAX_IMAGE_SIDE_PX = 10000  # Pages whose longest side would exceed this at the chosen DPI (e.g. large-format drawings) are rendered at a lower DPI
+JPEG_QUALITY = 75  # Quality for JPG page images, used by both PyMuPDF/Pillow and Poppler (75 is the default of both)
+PNG_COMPRESS_LEVEL = 3  # zlib level for PNGs encoded by Pillow; its default of 6 is ~1.5x slower for barely smaller files
+WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB buffer for PDF output files (pypdf issues many small writes)
+MERGE_IMAGE_BATCH = 16  # Max consecutive images combined into one multi-page PDF while merging
+MERGE_IMAGE_PIXELS = 40_000_000  # Max pixels Pillow holds decoded at once when it converts a batch (~120 MB as RGB)
+MERGE_PREFETCH_FILES = 4  # PDFs read into memory ahead of the one being merged
+MERGE_SPILL_BYTES = 256 << 20  # With pikepdf, merged sources held in memory beyond this are spilled to a temp file
+SPLIT_CHUNK_PAGES = 50  # Pages split with one pypdf reader before it is reopened, so its parsed objects don't pile up
+POPPLER_CHUNK_PAGES = 10  # Pages each pdftoppm process renders per convert_from_path call (bounds temp files)
+RENDER_QUEUE_DEPTH = 4  # Rendered pages allowed to wait for an encoder thread (bounds memory)
+PROGRESS_STEPS = 100  # Per-page loops report status/progress about this many times per job, however long
+UI_REFRESH_MS = 50  # How often pending status/progress updates are pushed to the widgets (~20 Hz)
+
+# Page-range workers are started with "spawn" on every platform: forking a process
+# that is running a Tk main loop is not safe.
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+
 # --- Constants for About Dialog ---
 APP_VERSION = "1.1.2" # Version updated
 RELEASE_DATE = "May 9, 2025"
@@ -21,6 +64,13 @@ GITHUB_URL = "https://github.com/imamwahyudime"
 LINKEDIN_URL = "https://www.linkedin.com/in/imam-wahyudi/"
 
 # --- Dependency Check Function ---
+def _module_available(name):
+    """True if `name` can be imported, found without actually importing it (which is slow for the PDF libraries)."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
 def perform_dependency_check():
     """
     Checks for essential Python libraries at startup.
@@ -29,24 +79,20 @@ def perform_dependency_check():
     missing_libs_info = []
     poppler_note_needed_if_pdf2image_missing = False
 
-    # Check PyPDF2
-    try:
-        import PyPDF2 # This import is just for the check
-    except ImportError:
-        missing_libs_info.append(("PyPDF2", "pip install PyPDF2"))
+    # Check pypdf (or its older predecessor PyPDF2, which has the same API)
+    if not _module_available("pypdf") and not _module_available("PyPDF2"):
+        missing_libs_info.append(("pypdf", "pip install pypdf"))
 
     # Check Pillow
-    try:
-        from PIL import Image # This import is just for the check
-    except ImportError:
+    if not _module_available("PIL"):
         missing_libs_info.append(("Pillow", "pip install Pillow"))
 
-    # Check pdf2image
-    try:
-        import pdf2image # This import is just for the check
-    except ImportError:
-        missing_libs_info.append(("pdf2image", "pip install pdf2image"))
-        poppler_note_needed_if_pdf2image_missing = True
+    # Check pdf2image (only needed when PyMuPDF isn't there to render pages to images)
+    if not _module_available("pdf2image"):
+        pymupdf_found = USE_PYMUPDF and _module_available("pymupdf")
+        if not pymupdf_found:
+            missing_libs_info.append(("pdf2image (or PyMuPDF instead, via pip install pymupdf)", "pip install pdf2image"))
+            poppler_note_needed_if_pdf2image_missing = True
 
     if missing_libs_info:
         # Need a temporary root to show the messagebox before the main app GUI is built
@@ -73,171 +119,665 @@ def perform_dependency_check():
         temp_root.destroy()
         sys.exit(1)  # Exit the script
 
+def load_backends():
+    """
+    Imports the PDF/image libraries into the module globals used by the backend functions.
+    Importing them takes a noticeable moment, so the GUI runs this on its worker thread
+    after the window is up instead of before it is built.
+    """
+    global pypdf, Image, convert_from_path, pdfinfo_from_path, pymupdf, pikepdf
+    try:
+        import pypdf
+    except ImportError:
+        import PyPDF2 as pypdf # Archived predecessor of pypdf with the same API
+    from PIL import Image
+    try:
+        from pdf2image import convert_from_path, pdfinfo_from_path
+    except ImportError:
+        convert_from_path = pdfinfo_from_path = None # Not needed: the dependency check found PyMuPDF instead
+
+    # PyMuPDF is optional: when present it replaces Poppler for PDF -> image rendering.
+    try:
+        import pymupdf
+    except ImportError:
+        pymupdf = None
+    # pikepdf is optional: when present it replaces pypdf for splitting to PDFs and merging.
+    try:
+        import pikepdf
+    except ImportError:
+        pikepdf = None
+
 # --- Backend Logic Function Definitions ---
-# Note: PyPDF2, PIL.Image, and pdf2image.convert_from_path will be imported
-# in the if __name__ == "__main__": block if the dependency check passes.
-# These functions will then use those globally imported modules.
+# Note: pypdf, PIL.Image, pdf2image.convert_from_path, pymupdf and pikepdf are
+# imported into the module globals by load_backends() once the dependency check
+# has passed. These functions then use those globally imported modules.
+
+_NAT_RE = re.compile(r'([0-9]+)')
+_IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png") # Images merge_pdfs converts to pages
+_MERGE_EXTENSIONS = (".pdf",) + _IMAGE_EXTENSIONS
 
-def natural_sort_key(s):
+@functools.lru_cache(maxsize=8192) # Bounded: the app can sort many folders in one session
+def _nat_key(path_str):
     """
-    Key function for natural sorting (handles numbers correctly).
-    Input 's' is expected to be a full path or just a filename.
+    Key function for natural sorting (numbers compare by value), given a full path or a filename.
+    Cached, and a tuple, since tuples compare faster than lists.
     """
-    filename_part = os.path.basename(s)
-    return [int(text) if text.isdigit() else text.lower()
-            for text in re.split('([0-9]+)', filename_part)]
+    return tuple(int(text) if text.isdigit() else text.lower()
+                 for text in _NAT_RE.split(os.path.basename(path_str)))
 
-def split_pdf_to_pdfs(input_path, output_dir, status_callback, progress_callback):
-    """Splits a PDF into single-page PDF files."""
+def _classify(path):
+    """
+    Returns "file", "dir" or "missing" for path from a single os.stat call,
+    where os.path.isfile followed by os.path.isdir would stat it twice.
+    """
     try:
-        if not os.path.isfile(input_path):
-            messagebox.showerror("Error", f"Input PDF file not found: {input_path}")
-            status_callback(f"Error: Input PDF not found {os.path.basename(input_path)}")
-            return False
-        if not os.path.isdir(output_dir):
-            try:
-                os.makedirs(output_dir, exist_ok=True)
-                status_callback(f"Created output directory: {output_dir}")
-            except OSError as e:
-                messagebox.showerror("Error", f"Output directory does not exist and cannot be created: {output_dir}\n{e}")
-                status_callback(f"Error: Output directory creation failed {output_dir}")
-                return False
+        mode = os.stat(path).st_mode
+    except (OSError, ValueError):
+        return "missing"
+    if stat.S_ISREG(mode):
+        return "file"
+    if stat.S_ISDIR(mode):
+        return "dir"
+    return "missing"
+
+@contextlib.contextmanager
+def _mapped_file(path):
+    """
+    Opens `path` as a read-only memory map, for pypdf, which would otherwise read a whole
+    file into memory just to open it. Only the pages touched are loaded, and worker
+    processes mapping the same file share them through the OS page cache.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield f # An empty file can't be mapped; let the PDF library report it as invalid
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+class ProcessingError(Exception):
+    """
+    Raised by the processing functions for a failure the user should see.
+    The GUI shows it in a message box (titled `title`) from the Tk thread.
+    """
+    def __init__(self, message, title="Error"):
+        super().__init__(message)
+        self.title = title
+
+def _make_output_dir(path):
+    """
+    Creates output directory `path` (and its parents) unless it already exists.
+    Returns the OSError if it can't be created, or None.
+    """
+    if _classify(path) == "dir": # One stat; makedirs on an existing folder costs a failed mkdir plus a stat
+        return None
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError as e:
+        return e
+    return None
 
+def _validate_split_args(input_path, output_dir, img_format=None):
+    """
+    Checks the split inputs before any work starts, creating output_dir if needed.
+    Returns an error message for the user, or None if the arguments are usable.
+    """
+    if not input_path:
+        return "Please select or enter an input PDF file."
+    if _classify(input_path) != "file":
+        return f"Input PDF file not found: {input_path}"
+    if not input_path.lower().endswith(".pdf"):
+        return f"Input for splitting must be a PDF file. Selected: {os.path.basename(input_path)}"
+    if img_format is not None and img_format.lower() not in ('jpg', 'png'):
+        return f"Invalid image format selected: {img_format}"
+    error = _make_output_dir(output_dir)
+    if error:
+        return f"Output directory '{output_dir}' is invalid and cannot be created: {error}"
+    return None
+
+def _validate_merge_args(output_path):
+    """
+    Checks the merge output path before any work starts, creating its folder if needed.
+    Returns an error message for the user, or None if the path is usable.
+    """
+    if not output_path.lower().endswith(".pdf"):
+        return f"Output for merging must be a PDF file (e.g., merged.pdf). Current: {output_path}"
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        error = _make_output_dir(output_dir)
+        if error:
+            return f"Output directory '{output_dir}' for merged file does not exist and cannot be created: {error}"
+    elif not os.path.isdir(os.getcwd()):
+        return f"Cannot determine a valid output directory for: {output_path}"
+    return None
+
+def split_pdf_to_pdfs(input_path, output_dir, status_callback, progress_callback, cancel_event=None):
+    """Splits a PDF into single-page PDF files. Returns False if `cancel_event` stopped it early."""
+    try:
         base_filename = os.path.splitext(os.path.basename(input_path))[0]
-        reader = PyPDF2.PdfReader(input_path) # PyPDF2 used here
-        num_pages = len(reader.pages)
-        progress_callback(0, num_pages)
-
-        for i, page in enumerate(reader.pages):
-            writer = PyPDF2.PdfWriter() # PyPDF2 used here
-            writer.add_page(page)
-            output_filename = os.path.join(output_dir, f"{base_filename}_page_{i + 1}.pdf")
-            with open(output_filename, "wb") as output_pdf:
-                writer.write(output_pdf)
-            status_callback(f"Created: {os.path.basename(output_filename)}")
-            progress_callback(i + 1, num_pages)
+        use_pikepdf = USE_PIKEPDF and pikepdf is not None
+        if use_pikepdf:
+            try:
+                with pikepdf.open(input_path) as pdf: # pikepdf used here
+                    num_pages = len(pdf.pages)
+            except pikepdf.PdfError:
+                status_callback(f"Error splitting: Invalid PDF {os.path.basename(input_path)}")
+                raise ProcessingError(f"Invalid or corrupted PDF file: {input_path}")
+        else:
+            with _mapped_file(input_path) as source:
+                num_pages = len(pypdf.PdfReader(source).pages) # pypdf used here
+
+        strategy, batch_size = _choose_strategy(num_pages, os.cpu_count() or 1)
+        tasks = [(input_path, start, end, output_dir, base_filename)
+                 for start, end in _page_ranges(num_pages, batch_size)]
+        worker = _split_page_range_pikepdf if use_pikepdf else _split_page_range
+        if not _run_page_ranges(worker, tasks, num_pages, "Created", strategy, status_callback, progress_callback,
+                                cancel_event=cancel_event):
+            return False # _run_page_ranges has reported how many pages were written
 
         status_callback("Splitting to PDFs complete.")
         return True
-    except PyPDF2.errors.PdfReadError: # PyPDF2 used here
-        messagebox.showerror("Error", f"Invalid or corrupted PDF file: {input_path}")
+    except pypdf.errors.PdfReadError: # pypdf used here
         status_callback(f"Error splitting: Invalid PDF {os.path.basename(input_path)}")
-        return False
+        raise ProcessingError(f"Invalid or corrupted PDF file: {input_path}")
+    except ProcessingError:
+        raise
     except Exception as e:
-        messagebox.showerror("Error", f"An error occurred during PDF splitting:\n{e}")
         status_callback(f"Error splitting: {e}")
+        raise ProcessingError(f"An error occurred during PDF splitting:\n{e}") from e
+
+def _choose_strategy(num_items, cpu):
+    """
+    Picks how to spread `num_items` independent work items (pages or files) over the CPU.
+    Returns (strategy, batch_size): strategy is "sequential", "threads" or "processes",
+    batch_size is how many items each task gets. Small jobs stay in-process so they
+    don't pay pool start-up cost; large ones use worker processes.
+    """
+    cpu = max(1, cpu)
+    if num_items <= 10:
+        return "sequential", max(1, num_items)
+    if num_items <= 50:
+        return "threads", 5
+    if num_items <= 200:
+        return "threads", math.ceil(num_items / cpu)
+    if num_items <= 500:
+        return "processes", min(200, math.ceil(num_items / cpu))
+    return "processes", min(500, math.ceil(num_items / cpu))
+
+def _page_ranges(num_pages, batch_size):
+    """Divides pages 0..num_pages into contiguous [start, end) ranges of at most batch_size pages."""
+    if num_pages <= 0:
+        return []
+    return [(start, min(start + batch_size, num_pages)) for start in range(0, num_pages, batch_size)]
+
+def _run_page_ranges(worker, tasks, num_pages, verb, strategy, status_callback, progress_callback, thread_safe=True, cancel_event=None):
+    """
+    Runs `worker` over the page-range tasks inline, in a thread pool or in a process pool.
+    Each worker returns the number of pages it wrote; progress is reported as ranges finish.
+    Workers that aren't thread-safe (PyMuPDF) run the thread-sized jobs inline instead: those are
+    too small to repay a process pool's start-up, and the worker's own encoder threads give overlap.
+    Returns False if `cancel_event` stopped the job before every page was written. Workers are
+    given the event (processes through a shared copy) and stop between pages; every range is
+    still waited for, so the pages reported as written are the ones on disk.
+    """
+    progress_callback(0, num_pages)
+    if not tasks:
+        return True
+    if strategy == "threads" and not thread_safe:
+        strategy = "sequential"
+    workers = min(len(tasks), os.cpu_count() or 1)
+
+    def cancelled():
+        return cancel_event is not None and cancel_event.is_set()
+
+    def run_range(task):
+        if cancelled():
+            return 0
+        return worker(task, cancel_event)
+
+    pages_done = 0
+    def report(results):
+        # Ranges queued when the cancel came return 0 at once and running ones stop at their
+        # next page, so draining every result after a cancel is quick
+        nonlocal pages_done
+        for pages_written in results:
+            pages_done += pages_written
+            status_callback(f"{verb} {pages_done}/{num_pages} pages")
+            progress_callback(pages_done, num_pages)
+        # A cancel pressed after the last page was written doesn't undo the job
+        if pages_done >= num_pages or not cancelled():
+            return True
+        status_callback(f"Cancelled: {verb.lower()} {pages_done}/{num_pages} pages.")
         return False
 
-def split_pdf_to_images(input_path, output_dir, img_format, status_callback, progress_callback):
-    """Splits a PDF into image files (JPG or PNG)."""
+    if strategy == "sequential" or workers == 1:
+        return report(run_range(task) for task in tasks)
+    elif strategy == "threads":
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = [executor.submit(run_range, task) for task in tasks]
+            # Count each range as soon as it is written, not in submission order
+            return report(future.result() for future in concurrent.futures.as_completed(futures))
+        finally:
+            executor.shutdown(cancel_futures=True)
+    else:
+        # Worker processes can't share cancel_event, so it is mirrored into a multiprocessing
+        # Event they are given at start-up. Waiting for results polls, so a cancel reaches the
+        # workers promptly instead of only after a range (up to 500 pages) has finished.
+        process_cancel = _MP_CONTEXT.Event()
+        def results(pool):
+            pending = pool.imap_unordered(_run_range_in_process, [(worker, task) for task in tasks])
+            for _ in tasks:
+                while True:
+                    if cancelled():
+                        process_cancel.set()
+                    try:
+                        yield pending.next(timeout=0.1)
+                        break
+                    except multiprocessing.TimeoutError:
+                        pass
+        with _MP_CONTEXT.Pool(workers, initializer=_set_process_cancel_event, initargs=(process_cancel,)) as pool:
+            # Every range's result is collected, so workers are never terminated in the middle
+            # of writing a file and the pages they wrote before stopping are counted
+            return report(results(pool))
+
+# Process-pool workers. These must stay top-level (picklable) and import their own
+# libraries, since spawned workers don't run the __main__ block below.
+_process_cancel_event = None # Set in each worker process by _set_process_cancel_event
+
+def _set_process_cancel_event(event):
+    global _process_cancel_event
+    _process_cancel_event = event
+
+def _run_range_in_process(worker_and_task):
+    """Runs a page-range worker in a pool process, with the pool's shared cancel event."""
+    worker, task = worker_and_task
+    return worker(task, _process_cancel_event)
+
+def _split_page_range(task, cancel_event=None):
+    """
+    Writes pages [start, end) of the input PDF as single-page PDF files. Returns the number
+    written, which is fewer if `cancel_event` was set part-way. In a pool process this is the
+    shared Event installed by _set_process_cancel_event.
+    """
     try:
-        if not os.path.isfile(input_path):
-            messagebox.showerror("Error", f"Input PDF file not found: {input_path}")
-            status_callback(f"Error: Input PDF not found {os.path.basename(input_path)}")
-            return False
-        if not os.path.isdir(output_dir):
-            try:
-                os.makedirs(output_dir, exist_ok=True)
-                status_callback(f"Created output directory: {output_dir}")
-            except OSError as e:
-                messagebox.showerror("Error", f"Output directory does not exist and cannot be created: {output_dir}\n{e}")
-                status_callback(f"Error: Output directory creation failed {output_dir}")
-                return False
+        import pypdf
+    except ImportError:
+        import PyPDF2 as pypdf
+    input_path, start, end, output_dir, base_filename = task
+    join = os.path.join
+    name_template = f"{base_filename}_page_{{}}.pdf"
+    # pypdf writes a PDF as many small pieces; serialising into memory first turns that
+    # into one write() per page. The buffer is reused so it doesn't regrow every page.
+    # The output file is buffered (not raw FileIO), so a short OS write is retried
+    # rather than silently truncating the page.
+    buf = io.BytesIO()
+    with _mapped_file(input_path) as source:
+        # The reader caches every object it parses, so a range of hundreds of pages would
+        # hold most of the document in memory by its end. Reopening it every
+        # SPLIT_CHUNK_PAGES pages keeps memory flat; the page tree's reference cycles
+        # mean the old reader is only freed by a gc pass.
+        for chunk_start in range(start, end, SPLIT_CHUNK_PAGES):
+            if chunk_start >= end: # Cut short by a cancel below
+                break
+            reader = pypdf.PdfReader(source)
+            for i in range(chunk_start, min(chunk_start + SPLIT_CHUNK_PAGES, end)):
+                if cancel_event is not None and cancel_event.is_set():
+                    end = i
+                    break
+                writer = pypdf.PdfWriter()
+                writer.add_page(reader.pages[i])
+                buf.seek(0)
+                buf.truncate()
+                writer.write(buf)
+                output_filename = join(output_dir, name_template.format(i + 1))
+                with open(output_filename, "wb", buffering=WRITE_BUFFER_SIZE) as output_pdf:
+                    output_pdf.write(buf.getbuffer())
+            reader = writer = None
+            gc.collect()
+    return end - start
+
+def _split_page_range_pikepdf(task, cancel_event=None):
+    """Same as _split_page_range, but copies each page with qpdf (pikepdf)."""
+    import pikepdf
+    input_path, start, end, output_dir, base_filename = task
+    join = os.path.join
+    name_template = f"{base_filename}_page_{{}}.pdf"
+    with pikepdf.open(input_path) as src:
+        for i in range(start, end):
+            if cancel_event is not None and cancel_event.is_set():
+                end = i
+                break
+            with pikepdf.new() as out:
+                out.pages.append(src.pages[i])
+                out.save(join(output_dir, name_template.format(i + 1)))
+    return end - start
+
+def _capped_dpi(dpi, width_pt, height_pt):
+    """Lowers `dpi` if needed so a page of this size (in points) is at most MAX_IMAGE_SIDE_PX on its longest side."""
+    longest = max(width_pt, height_pt)
+    if longest <= 0:
+        return dpi
+    return max(1, min(dpi, int(MAX_IMAGE_SIDE_PX * 72 / longest)))
+
+def _render_page_range(task, cancel_event=None):
+    """
+    Renders pages [start, end) with PyMuPDF. Where PIL is the faster encoder, pages are
+    handed to PIL encoder threads, so encoding one page overlaps rendering the next.
+    """
+    import pymupdf
+    from PIL import Image
+    input_path, start, end, output_dir, base_filename, img_format_lower, dpi, encoders = task
+    join = os.path.join
+    name_template = f"{base_filename}_page_{{}}.{img_format_lower}"
+    pending = collections.deque()
+    # MuPDF's own PNG encoder beats PIL's on a single thread, so PNG only goes through
+    # PIL when there are several encoder threads to spread it over. Its JPEG encoder is
+    # several times slower than PIL's, so JPG always does.
+    use_pil = img_format_lower == "jpg" or encoders > 1
+    if img_format_lower == "png":
+        save_options = {"format": "PNG", "compress_level": PNG_COMPRESS_LEVEL}
+    else:
+        save_options = {"format": "JPEG", "quality": JPEG_QUALITY} # Baseline, unoptimised: progressive/optimize add extra encoding passes
+    def encode(image, output_filename, page_dpi):
+        # PIL writes in 64 KiB blocks; a larger file buffer turns a page into a few write() calls
+        with open(output_filename, "wb", buffering=WRITE_BUFFER_SIZE) as output_image:
+            image.save(output_image, dpi=(page_dpi, page_dpi), **save_options)
+    # Rendering stays on this thread (PyMuPDF is not thread-safe); PIL releases the GIL
+    # while encoding, so the encoder threads run in parallel with it and with each other.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=encoders) as pool, pymupdf.open(input_path) as doc:
+        for i in range(start, end):
+            if cancel_event is not None and cancel_event.is_set():
+                end = i
+                break
+            page = doc[i]
+            page_dpi = _capped_dpi(dpi, page.rect.width, page.rect.height)
+            # alpha=False gives an RGB pixmap, so JPG needs no RGBA->RGB conversion
+            pix = page.get_pixmap(dpi=page_dpi, alpha=False)
+            output_filename = join(output_dir, name_template.format(i + 1))
+            if use_pil:
+                image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples_mv, "raw", "RGB", pix.stride)
+                pending.append(pool.submit(encode, image, output_filename, page_dpi))
+                # Cap the pages waiting to be encoded so memory doesn't grow with the page count
+                if len(pending) >= RENDER_QUEUE_DEPTH:
+                    pending.popleft().result()
+            else:
+                pix.save(output_filename)
+            # Free this page's samples before the next page is rendered; otherwise
+            # rebinding `pix` keeps two full-page buffers alive at once.
+            del pix
+        for future in pending:
+            future.result()
+    return end - start
+
+@functools.lru_cache(maxsize=None)
+def _load_img2pdf():
+    """Imports img2pdf on first use (worker processes included); None if it's missing or disabled."""
+    if not USE_IMG2PDF:
+        return None
+    try:
+        import img2pdf
+    except ImportError:
+        return None
+    return img2pdf
 
-        status_callback("Converting PDF pages to images (may take time)...")
-        progress_callback(0, 1)
-        poppler_path_arg = {"poppler_path": POPPLER_PATH} if POPPLER_PATH else {}
-        
+def _images_to_pdf_bytes(filepaths):
+    """
+    Converts a run of JPG/PNG files into PDF pages held in memory.
+    Returns (pdf_parts, converted, skipped, fallback_error): pdf_parts is a list of multi-page PDFs
+    (as bytes) holding the converted images in order, empty if none could be converted, `skipped`
+    lists (filepath, error) for images that couldn't be opened or written, and fallback_error is
+    why img2pdf rejected the batch (None if it didn't or isn't installed).
+    """
+    img2pdf = _load_img2pdf()
+    fallback_error = None
+    if img2pdf is not None:
+        # img2pdf embeds the file data directly, so a JPEG is neither decoded nor re-compressed.
+        # Pages get the same 100 DPI size as the Pillow path. If it rejects any file in the
+        # batch, Pillow below converts the batch instead and skips just the unreadable files.
+        try:
+            # Given the file contents rather than paths: img2pdf takes a string it can't open as
+            # raw image data, so a file deleted since it was picked would fail with a TypeError
+            image_data = [_read_file_bytes(filepath) for filepath in filepaths]
+            pdf_bytes = img2pdf.convert(image_data, layout_fun=img2pdf.get_fixed_dpi_layout_fun((100, 100)))
+            return [pdf_bytes], list(filepaths), [], None
+        # Unreadable or missing files, alpha channels and colour spaces img2pdf can't embed as-is
+        except (img2pdf.ImageOpenError, img2pdf.AlphaChannelError, img2pdf.JpegColorspaceError,
+                img2pdf.UnsupportedColorspaceError, ValueError, OSError) as e:
+            fallback_error = e
+    from PIL import Image
+    pdf_parts, converted, skipped = [], [], []
+
+    def save_pages(images):
+        pdf_bytes_io = io.BytesIO()
+        images[0].save(pdf_bytes_io, format='PDF', resolution=100.0, save_all=True, append_images=images[1:])
+        return pdf_bytes_io.getvalue()
+
+    def flush(group):
+        """Writes the opened images in `group` as one PDF, or one PDF each if the batch save fails."""
+        try:
+            pdf_parts.append(save_pages([image for _, image in group]))
+            converted.extend(filepath for filepath, _ in group)
+        except (OSError, ValueError):
+            # One image the PDF writer can't handle fails the whole save; write them one at a
+            # time so only that file is skipped
+            for filepath, image in group:
+                try:
+                    pdf_parts.append(save_pages([image]))
+                    converted.append(filepath)
+                except (OSError, ValueError) as e:
+                    skipped.append((filepath, e))
+        finally:
+            for _, image in group:
+                image.close()
+        group.clear()
+
+    group, group_pixels = [], 0
+    for filepath in filepaths:
         try:
-            images = convert_from_path(input_path, **poppler_path_arg) # pdf2image.convert_from_path used here
-        except Exception as e_convert:
-            error_str = str(e_convert).lower()
-            error_type_str = str(type(e_convert)).lower()
-            if "poppler" in error_str or \
-               "pdftoppm" in error_str or \
-               "pdfinfo" in error_str or \
-               "filenotfounderror" in error_type_str and "pdf" in error_str or \
-               "pdftoolsnotinstallederror" in error_type_str or \
-               "pdffilenotfounderror" in error_type_str or \
-               "pdfinfo" in error_type_str :
-                messagebox.showerror("Poppler Error",
-                                     "Poppler utility not found or failed during execution.\n"
-                                     "Ensure Poppler is installed and in your system PATH,\n"
-                                     "or set the POPPLER_PATH variable in the script.\n\n"
-                                     f"Details: {e_convert}")
-                status_callback(f"Error: Poppler execution failed: {e_convert}")
-                return False
-            raise 
-
-        progress_callback(1, 1)
-
-        num_pages = len(images)
-        progress_callback(0, num_pages)
+            # verify() checks the file without decoding it, so a broken file is skipped on its own;
+            # the image is reopened, since a verified one can't be used, and decoded as it is saved
+            with Image.open(filepath) as probe:
+                probe.verify()
+            image = Image.open(filepath)
+            if getattr(image, "n_frames", 1) > 1:
+                # save_all writes every frame, so an animated PNG would become several pages;
+                # like img2pdf, only its first frame is used
+                image.seek(0)
+                with image:
+                    image = image.copy()
+            if image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info):
+                # Flatten onto white in one pass; convert('RGB') alone would drop the alpha
+                # and show transparent areas in whatever colour they happen to store (often black)
+                image = image.convert('RGBA')
+                flattened = Image.new('RGB', image.size, (255, 255, 255))
+                flattened.paste(image, mask=image.getchannel('A'))
+                image = flattened
+            elif image.mode not in ('1', 'L', 'RGB', 'CMYK'):
+                image = image.convert('RGB') # P, and modes the PDF writer can't save (I;16, I, F, ...)
+        except (OSError, ValueError, SyntaxError) as e: # OSError includes FileNotFoundError and PIL.UnidentifiedImageError
+            skipped.append((filepath, e))
+            continue
+        # Every image in a group is decoded by the time the group is saved, so groups are
+        # bounded by pixel count: a batch of large photos would otherwise all be held at once
+        pixels = image.width * image.height
+        if group and group_pixels + pixels > MERGE_IMAGE_PIXELS:
+            flush(group)
+            group_pixels = 0
+        group.append((filepath, image))
+        group_pixels += pixels
+    if group:
+        flush(group)
+    return pdf_parts, converted, skipped, fallback_error
+
+def _read_file_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def _render_pages_pymupdf(input_path, output_dir, base_filename, img_format_lower, dpi, status_callback, progress_callback, cancel_event=None):
+    """Renders every page with PyMuPDF, spreading page ranges across CPU cores for larger documents."""
+    with pymupdf.open(input_path) as doc: # pymupdf used here
+        num_pages = doc.page_count
+    cpu = os.cpu_count() or 1
+    strategy, batch_size = _choose_strategy(num_pages, cpu)
+    ranges = _page_ranges(num_pages, batch_size)
+    # Share the cores between the ranges running at once; each range gets at least one encoder thread.
+    # Only the process pool runs ranges at once: "threads" jobs run inline for PyMuPDF.
+    parallel_ranges = max(1, min(len(ranges), cpu)) if strategy == "processes" else 1
+    encoders = max(1, min(4, cpu // parallel_ranges))
+    tasks = [(input_path, start, end, output_dir, base_filename, img_format_lower, dpi, encoders)
+             for start, end in ranges]
+    return _run_page_ranges(_render_page_range, tasks, num_pages, "Saved", strategy, status_callback, progress_callback,
+                            thread_safe=False, cancel_event=cancel_event) # PyMuPDF must not be used from several threads
+
+def _raise_if_poppler_failure(exc, input_path, status_callback):
+    """
+    Raises a ProcessingError if an exception from pdf2image means the input isn't a valid PDF,
+    or that Poppler is missing or failed to run. Other exceptions are left to the caller.
+    """
+    from pdf2image.exceptions import (PDFInfoNotInstalledError, PDFPageCountError, PDFPopplerTimeoutError,
+                                      PopplerNotInstalledError)
+    # pdfinfo runs first and can't read a page count from a corrupt or non-PDF file. (PDFSyntaxError
+    # is only raised by convert_from_path(strict=True), which would also fail on harmless warnings.)
+    if isinstance(exc, PDFPageCountError):
+        status_callback(f"Error splitting: Invalid PDF {os.path.basename(input_path)}")
+        raise ProcessingError(f"Invalid or corrupted PDF file: {input_path}") from exc
+    # A FileNotFoundError naming pdftoppm/pdfinfo comes from starting a Poppler tool that isn't there
+    missing_tool = isinstance(exc, FileNotFoundError) and \
+        os.path.basename(str(exc.filename or "")).lower().startswith(("pdftoppm", "pdfinfo"))
+    if missing_tool or isinstance(exc, (PDFInfoNotInstalledError, PopplerNotInstalledError, PDFPopplerTimeoutError)):
+        status_callback(f"Error: Poppler execution failed: {exc}")
+        raise ProcessingError("Poppler utility not found or failed during execution.\n"
+                              "Ensure Poppler is installed and in your system PATH,\n"
+                              "or set the POPPLER_PATH variable in the script.\n\n"
+                              f"Details: {exc}", title="Poppler Error") from exc
+
+def split_pdf_to_images(input_path, output_dir, img_format, status_callback, progress_callback, dpi=IMAGE_DPI, cancel_event=None):
+    """Splits a PDF into image files (JPG or PNG) rendered at `dpi`. Returns False if `cancel_event` stopped it early."""
+    try:
         base_filename = os.path.splitext(os.path.basename(input_path))[0]
         img_format_lower = img_format.lower()
-        if img_format_lower not in ['jpg', 'png']:
-            raise ValueError("Invalid image format selected.")
 
-        for i, image in enumerate(images): # PIL.Image object from pdf2image
-            output_filename = os.path.join(output_dir, f"{base_filename}_page_{i + 1}.{img_format_lower}")
-            if img_format_lower == 'jpg' and image.mode == 'RGBA':
-                image = image.convert('RGB') # PIL.Image used here
-            image.save(output_filename, format=img_format_lower.upper()) # PIL.Image used here
-            status_callback(f"Saved: {os.path.basename(output_filename)}")
-            progress_callback(i + 1, num_pages)
+        if USE_PYMUPDF and pymupdf is not None:
+            status_callback("Rendering PDF pages to images with PyMuPDF...")
+            if not _render_pages_pymupdf(input_path, output_dir, base_filename, img_format_lower, dpi,
+                                         status_callback, progress_callback, cancel_event):
+                return False # _run_page_ranges has reported how many pages were written
+            status_callback("Splitting to images complete.")
+            return True
+
+        status_callback("Converting PDF pages to images (may take time)...")
+        poppler_path_arg = {"poppler_path": POPPLER_PATH} if POPPLER_PATH else {}
+        # Leave one core free for the GUI; Poppler spawns one pdftoppm per thread
+        thread_count = max(1, (os.cpu_count() or 1) - 1)
+
+        # Poppler writes the encoded pages straight into a temp folder, so no PIL
+        # images are held in memory and no re-encoding happens in Python. The folder
+        # lives inside output_dir so each page is a rename, never a cross-drive copy.
+        # Pages are converted in chunks, so the temp folder only ever holds one chunk
+        # and progress moves while Poppler works through a long document.
+        with tempfile.TemporaryDirectory(dir=output_dir, prefix=".pdf_utility_") as tmpdir:
+            try:
+                pdf_info = pdfinfo_from_path(input_path, **poppler_path_arg) # pdf2image.pdfinfo_from_path used here
+            except Exception as e_convert:
+                _raise_if_poppler_failure(e_convert, input_path, status_callback)
+                raise
+            num_pages = pdf_info["Pages"]
+            # pdftoppm takes one DPI for the whole run, so cap it by the first page's size ("612 x 792 pts (letter)")
+            page_size = re.match(r"\s*([\d.]+) x ([\d.]+)", str(pdf_info.get("Page size", "")))
+            if page_size:
+                dpi = _capped_dpi(dpi, float(page_size.group(1)), float(page_size.group(2)))
+            progress_callback(0, num_pages)
+
+            join = os.path.join
+            name_template = f"{base_filename}_page_{{}}.{img_format_lower}"
+            status, progress = status_callback, progress_callback
+            chunk_pages = POPPLER_CHUNK_PAGES * thread_count
+            format_arg = {"jpegopt": {"quality": JPEG_QUALITY}} if img_format_lower == "jpg" else {}
+            report_every = max(1, num_pages // PROGRESS_STEPS)
+            for first_page in range(1, num_pages + 1, chunk_pages):
+                if cancel_event is not None and cancel_event.is_set():
+                    status_callback("Splitting cancelled.")
+                    return False
+                last_page = min(first_page + chunk_pages - 1, num_pages)
+                status(f"Converting pages {first_page}-{last_page} of {num_pages}...")
+                try:
+                    image_paths = convert_from_path(input_path, dpi=dpi, thread_count=thread_count, output_folder=tmpdir,
+                                                    first_page=first_page, last_page=last_page,
+                                                    paths_only=True, fmt=img_format_lower,
+                                                    **format_arg, **poppler_path_arg) # pdf2image.convert_from_path used here
+                except Exception as e_convert:
+                    _raise_if_poppler_failure(e_convert, input_path, status_callback)
+                    raise
+
+                for i, image_path in enumerate(image_paths, start=first_page - 1):
+                    output_name = name_template.format(i + 1)
+                    # pdftoppm already wrote the final PNG/JPG (JPEG output is always RGB or gray),
+                    # so the page only needs its final name
+                    os.replace(image_path, join(output_dir, output_name))
+                    # Formatting a status string per page adds up on long documents, so only report every Nth page
+                    if (i + 1) % report_every == 0 or i + 1 == last_page:
+                        status(f"Saved: {output_name}")
+                        progress(i + 1, num_pages)
 
         status_callback("Splitting to images complete.")
         return True
     except ImportError: # Should ideally be caught by perform_dependency_check now
-        messagebox.showerror("Error", "Pillow or pdf2image library not found. Please install them (e.g., pip install Pillow pdf2image).")
         status_callback("Error: Missing required library for image splitting.")
-        return False
+        raise ProcessingError("Pillow or pdf2image library not found. Please install them (e.g., pip install Pillow pdf2image).")
+    except ProcessingError:
+        raise
     except Exception as e:
-        messagebox.showerror("Error", f"An error occurred during image splitting:\n{e}")
         status_callback(f"Error splitting to images: {e}")
-        return False
-
-
-def merge_pdfs(input_sources_list_or_path, output_path, status_callback, progress_callback):
-    writer = PyPDF2.PdfWriter() # PyPDF2 used here
+        raise ProcessingError(f"An error occurred during image splitting:\n{e}") from e
+
+
+def merge_pdfs(input_sources_list_or_path, output_path, status_callback, progress_callback, cancel_event=None):
+    use_pikepdf = USE_PIKEPDF and pikepdf is not None
+    writer = pikepdf.new() if use_pikepdf else pypdf.PdfWriter() # pikepdf / pypdf used here
+    # qpdf copies page streams out of their source PDF only when the output is saved,
+    # so every pikepdf source has to stay open until then.
+    pikepdf_sources = []
+    # Parsed sources keyed by a hash of their bytes: a file that appears several times
+    # (a cover sheet between chapters, say) is parsed once and its objects shared.
+    parsed_sources = {}
+    buffered_bytes = 0 # Size of the in-memory pikepdf sources not yet written out
+    spill_path = None
     actual_files_to_process = []
 
     if isinstance(input_sources_list_or_path, list):
-        temp_files = [f for f in input_sources_list_or_path if os.path.isfile(f)]
-        actual_files_to_process = sorted(temp_files, key=natural_sort_key)
+        # No isfile pass here (a stat per file, slow on network shares): every file is opened
+        # below anyway, and one that has gone missing since it was picked is skipped with a message
+        actual_files_to_process = sorted(input_sources_list_or_path, key=_nat_key)
     elif isinstance(input_sources_list_or_path, str):
         single_path = input_sources_list_or_path
-        if os.path.isdir(single_path):
+        single_path_kind = _classify(single_path)
+        if single_path_kind == "dir":
             folder = single_path
             status_callback(f"Scanning folder: {folder}")
             try:
-                filenames_in_folder = os.listdir(folder)
-                full_paths_in_folder = [os.path.join(folder, fn) for fn in filenames_in_folder if fn.lower().endswith((".pdf", ".jpg", ".jpeg", ".png"))]
-                actual_files_to_process = sorted(full_paths_in_folder, key=natural_sort_key)
+                with os.scandir(folder) as entries:
+                    full_paths_in_folder = [entry.path for entry in entries
+                                            if entry.name.lower().endswith(_MERGE_EXTENSIONS) and entry.is_file()]
+                actual_files_to_process = sorted(full_paths_in_folder, key=_nat_key)
             except OSError as e:
-                messagebox.showerror("Error", f"Could not read directory: {folder}\n{e}")
                 status_callback(f"Error reading directory: {e}")
-                return False
-        elif os.path.isfile(single_path):
-            if single_path.lower().endswith((".pdf", ".jpg", ".jpeg", ".png")):
+                raise ProcessingError(f"Could not read directory: {folder}\n{e}")
+        elif single_path_kind == "file":
+            if single_path.lower().endswith(_MERGE_EXTENSIONS):
                  actual_files_to_process.append(single_path)
             else:
-                messagebox.showerror("Error", f"Unsupported file type for merging: {os.path.basename(single_path)}")
                 status_callback(f"Error: Unsupported file type: {os.path.basename(single_path)}")
-                return False
+                raise ProcessingError(f"Unsupported file type for merging: {os.path.basename(single_path)}")
         else:
-            messagebox.showerror("Error", f"Input path not found or invalid: {single_path}")
             status_callback(f"Error: Input path not found: {single_path}")
-            return False
+            raise ProcessingError(f"Input path not found or invalid: {single_path}")
     else:
-        messagebox.showerror("Error", "Invalid input source type for merging.")
         status_callback("Error: Invalid input for merge.")
-        return False
+        raise ProcessingError("Invalid input source type for merging.")
 
     if not actual_files_to_process:
-        messagebox.showerror("Error", "No valid PDF or Image files found for merging.")
         status_callback("No valid files found to merge.")
-        return False
+        raise ProcessingError("No valid PDF or Image files found for merging.")
 
     status_callback(f"Found {len(actual_files_to_process)} file(s) to merge (sorted naturally).")
     total_files = len(actual_files_to_process)
@@ -245,91 +785,267 @@ def merge_pdfs(input_sources_list_or_path, output_path, status_callback, progres
     successful_merges = 0
     files_skipped = 0
 
-    for i, filepath in enumerate(actual_files_to_process):
-        base_filename = os.path.basename(filepath)
-        status_callback(f"Processing: {base_filename} ({i+1}/{total_files})")
+    # Runs of consecutive images are cut into batches that each become one multi-page PDF,
+    # so N images cost one pypdf parse/append instead of N. PDFs are appended one by one.
+    # Each path's type is worked out once here; later steps only look at the plan's kind.
+    def file_kind(filepath):
+        extension = os.path.splitext(filepath)[1].lower()
+        if extension in _IMAGE_EXTENSIONS:
+            return "images"
+        return "pdf" if extension == ".pdf" else "unsupported"
+    merge_plan = []
+    for kind, run in itertools.groupby(actual_files_to_process, key=file_kind):
+        run = list(run)
+        if kind == "images":
+            merge_plan.extend(("images", run[start:start + MERGE_IMAGE_BATCH]) for start in range(0, len(run), MERGE_IMAGE_BATCH))
+        else:
+            merge_plan.extend((kind, [filepath]) for filepath in run)
+
+    # Image -> PDF conversion is the CPU-heavy, independent part of a merge, so it can be
+    # done up front in a pool; appending to the writer has to stay sequential and in order.
+    image_batches = {index: batch for index, (kind, batch) in enumerate(merge_plan) if kind == "images"}
+    strategy, _ = _choose_strategy(sum(len(batch) for batch in image_batches.values()), os.cpu_count() or 1)
+    workers = min(len(image_batches), os.cpu_count() or 1)
+    executor = None
+    if strategy == "threads" and workers > 1:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    elif strategy == "processes" and workers > 1:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=_MP_CONTEXT)
+    # Batches are submitted a few ahead of the loop rather than all at once: a finished batch's
+    # PDF bytes wait in its future until the loop reaches it, so an unbounded queue would hold
+    # every converted image in memory at the same time.
+    image_indices = iter(image_batches)
+    pending_images = {}
+    def submit_image_batches():
+        while executor is not None and len(pending_images) < 2 * workers:
+            index = next(image_indices, None)
+            if index is None:
+                return
+            pending_images[index] = executor.submit(_images_to_pdf_bytes, image_batches[index])
+
+    # Both backends read a whole PDF into memory before parsing it. Those reads are done a
+    # few files ahead on I/O threads, so the disk works while the loop parses and appends.
+    pdf_indices = iter([index for index, (kind, batch) in enumerate(merge_plan) if kind == "pdf"])
+    read_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    pending_reads = {}
+    def prefetch_reads():
+        while len(pending_reads) < MERGE_PREFETCH_FILES:
+            index = next(pdf_indices, None)
+            if index is None:
+                return
+            pending_reads[index] = read_pool.submit(_read_file_bytes, merge_plan[index][1][0])
+
+    def spill_to_disk():
+        """Saves the pages merged so far to a temp file and reopens it, so the source bytes can be freed."""
+        nonlocal writer, spill_path, buffered_bytes
+        status_callback("Writing merged pages to a temporary file to free memory...")
+        # Not named *.pdf: if the app is killed mid-merge, a leftover spill file mustn't be
+        # picked up by a later merge of the same folder
+        fd, new_spill_path = tempfile.mkstemp(suffix=".spill", prefix=".pdf_utility_", dir=os.path.dirname(os.path.abspath(output_path)))
+        os.close(fd)
         try:
-            file_ext = filepath.lower().split('.')[-1]
-            if file_ext in ("jpg", "jpeg", "png"):
-                image = Image.open(filepath) # PIL.Image used here
-                if image.mode == 'RGBA' or image.mode == 'P':
-                    image = image.convert('RGB')
-                pdf_bytes_io = io.BytesIO()
-                image.save(pdf_bytes_io, format='PDF', resolution=100.0, save_all=False)
-                pdf_bytes_io.seek(0)
-                
-                try:
-                    img_pdf_reader = PyPDF2.PdfReader(pdf_bytes_io) # PyPDF2 used here
-                    if not img_pdf_reader.pages:
-                        raise PyPDF2.errors.PdfReadError("Converted image resulted in an empty PDF.") # PyPDF2 used here
-                    writer.append(fileobj=pdf_bytes_io) 
-                except PyPDF2.errors.PdfReadError as img_pdf_err: # PyPDF2 used here
-                    status_callback(f"Skipping image {base_filename}: conversion to PDF failed or resulted in invalid PDF. Error: {img_pdf_err}")
-                    files_skipped +=1
-                    continue
-                
-                successful_merges += 1
-                status_callback(f"Converted and appended image: {base_filename}")
-            elif file_ext == "pdf":
+            writer.save(new_spill_path) # pikepdf used here
+        except Exception as e:
+            with contextlib.suppress(OSError):
+                os.remove(new_spill_path)
+            status_callback(f"Error writing temporary file: {e}")
+            raise ProcessingError(f"An error occurred while writing merged pages to a temporary file:\n{e}") from e
+        writer.close()
+        for src_pdf in pikepdf_sources:
+            src_pdf.close()
+        pikepdf_sources.clear()
+        parsed_sources.clear()
+        if spill_path is not None:
+            os.remove(spill_path)
+        spill_path = new_spill_path
+        writer = pikepdf.open(spill_path) # Read lazily from disk, unlike the sources
+        buffered_bytes = 0
+
+    def release_sources():
+        """Closes the pikepdf sources and deletes the spill file; safe to call more than once."""
+        nonlocal spill_path
+        for src_pdf in pikepdf_sources:
+            src_pdf.close()
+        pikepdf_sources.clear()
+        if spill_path is not None:
+            writer.close()
+            with contextlib.suppress(OSError):
+                os.remove(spill_path)
+            spill_path = None
+
+    files_done = 0
+    cancelled = False
+    # Everything from here to the save runs under one finally, so the worker pools are shut down
+    # and the pikepdf sources/spill file released however the merge ends (error, cancel or success)
+    try:
+        for index, (kind, batch) in enumerate(merge_plan):
+            if cancel_event is not None and cancel_event.is_set():
+                cancelled = True
+                break
+            files_done += len(batch)
+            prefetch_reads()
+            submit_image_batches()
+            if buffered_bytes >= MERGE_SPILL_BYTES:
+                spill_to_disk()
+            if kind == "images":
+                status_callback(f"Converting {len(batch)} image(s): {os.path.basename(batch[0])} ... ({files_done}/{total_files})")
+                converted, skipped = [], [] # Reset so the handlers below never see the previous batch's lists
                 try:
-                    pdf_to_append_reader = PyPDF2.PdfReader(filepath) # PyPDF2 used here
-                    if pdf_to_append_reader.is_encrypted:
+                    if executor is not None:
+                        pdf_parts, converted, skipped, fallback_error = pending_images.pop(index).result()
+                    else:
+                        pdf_parts, converted, skipped, fallback_error = _images_to_pdf_bytes(batch) # PIL.Image used here
+                    if fallback_error is not None:
+                        status_callback(f"img2pdf could not convert the batch ({fallback_error}); converting with Pillow instead.")
+                    for filepath, img_err in skipped:
+                        status_callback(f"Cannot identify or open image file: {os.path.basename(filepath)}. Skipping. ({img_err})")
+                    files_skipped += len(skipped)
+                    # Every part is parsed before any is appended, so a bad part skips the batch's
+                    # images without leaving some of their pages in the output
+                    if pdf_parts and use_pikepdf:
+                        img_pdfs = []
+                        try:
+                            for pdf_bytes in pdf_parts:
+                                img_pdfs.append(pikepdf.open(io.BytesIO(pdf_bytes))) # pikepdf used here
+                        except Exception:
+                            for img_pdf in img_pdfs:
+                                img_pdf.close()
+                            raise
+                        for img_pdf in img_pdfs:
+                            pikepdf_sources.append(img_pdf)
+                            writer.pages.extend(img_pdf.pages)
+                        buffered_bytes += sum(len(pdf_bytes) for pdf_bytes in pdf_parts)
+                        successful_merges += len(converted)
+                        status_callback(f"Converted and appended {len(converted)} image(s): {', '.join(os.path.basename(f) for f in converted)}")
+                    elif pdf_parts:
+                        img_pdf_readers = [pypdf.PdfReader(io.BytesIO(pdf_bytes)) for pdf_bytes in pdf_parts] # pypdf used here
+                        if not all(img_pdf_reader.pages for img_pdf_reader in img_pdf_readers):
+                            raise pypdf.errors.PdfReadError("Converted image resulted in an empty PDF.") # pypdf used here
+                        for img_pdf_reader in img_pdf_readers:
+                            writer.append(img_pdf_reader) # Reuse the parsed reader rather than re-reading the bytes
+                        successful_merges += len(converted)
+                        status_callback(f"Converted and appended {len(converted)} image(s): {', '.join(os.path.basename(f) for f in converted)}")
+                except pypdf.errors.PdfReadError as img_pdf_err: # pypdf used here
+                    status_callback(f"Skipping {len(converted)} image(s): conversion to PDF failed or resulted in invalid PDF. Error: {img_pdf_err}")
+                    files_skipped += len(converted)
+                except Exception as e:
+                    status_callback(f"Error converting images starting at {os.path.basename(batch[0])}: {e}. Skipping.")
+                    files_skipped += len(batch) - len(skipped) # Unreadable images were already counted above
+                progress_callback(files_done, total_files)
+                continue
+
+            filepath = batch[0]
+            base_filename = os.path.basename(filepath)
+            status_callback(f"Processing: {base_filename} ({files_done}/{total_files})")
+            try:
+                if kind == "pdf" and use_pikepdf:
+                    pdf_data = pending_reads.pop(index).result()
+                    digest = hashlib.blake2b(pdf_data, digest_size=16).digest()
+                    src_pdf = parsed_sources.get(digest)
+                    if src_pdf is None:
                         try:
-                            if pdf_to_append_reader.decrypt("") == PyPDF2.PasswordStates.WRONG_PASSWORD: # PyPDF2 used here
-                                status_callback(f"Skipping encrypted PDF (password protected): {base_filename}")
-                                files_skipped +=1
-                                continue
-                        except Exception as decrypt_err:
-                            status_callback(f"Skipping encrypted PDF {base_filename} (decryption failed): {decrypt_err}")
+                            # Open from the bytes already read rather than the path: keeping an OS file
+                            # handle open per source until the save would run out of handles on large folders.
+                            src_pdf = pikepdf.open(io.BytesIO(pdf_data)) # pikepdf used here
+                        except pikepdf.PasswordError:
+                            status_callback(f"Skipping encrypted PDF (password protected): {base_filename}")
                             files_skipped += 1
                             continue
-                    
-                    writer.append(filepath) # PyPDF2 used here
+                        except pikepdf.PdfError as read_err:
+                            status_callback(f"Skipping invalid/corrupted PDF: {base_filename}. Error: {read_err}")
+                            files_skipped += 1
+                            continue
+                        pikepdf_sources.append(src_pdf)
+                        parsed_sources[digest] = src_pdf
+                        buffered_bytes += len(pdf_data)
+                    writer.pages.extend(src_pdf.pages)
                     successful_merges += 1
                     status_callback(f"Appended PDF: {base_filename}")
-                except PyPDF2.errors.PdfReadError as read_err: # PyPDF2 used here
-                    status_callback(f"Skipping invalid/corrupted PDF: {base_filename}. Error: {read_err}")
-                    files_skipped +=1
-                    continue
-                except Exception as append_err:
-                    status_callback(f"Error appending PDF {base_filename}: {append_err}. Skipping.")
+                elif kind == "pdf":
+                    try:
+                        pdf_data = pending_reads.pop(index).result()
+                        digest = hashlib.blake2b(pdf_data, digest_size=16).digest()
+                        pdf_to_append_reader = parsed_sources.get(digest)
+                        if pdf_to_append_reader is None:
+                            pdf_to_append_reader = pypdf.PdfReader(io.BytesIO(pdf_data)) # pypdf used here
+                            if pdf_to_append_reader.is_encrypted:
+                                try:
+                                    if pdf_to_append_reader.decrypt("") == pypdf.PasswordType.NOT_DECRYPTED: # pypdf used here
+                                        status_callback(f"Skipping encrypted PDF (password protected): {base_filename}")
+                                        files_skipped +=1
+                                        continue
+                                except Exception as decrypt_err:
+                                    status_callback(f"Skipping encrypted PDF {base_filename} (decryption failed): {decrypt_err}")
+                                    files_skipped += 1
+                                    continue
+                            parsed_sources[digest] = pdf_to_append_reader
+                    
+                        # Append from the reader that is already parsed instead of letting
+                        # append(filepath) open and parse the same file a second time.
+                        # Outlines are left out, as on the pikepdf path, which copies pages only.
+                        writer.append(pdf_to_append_reader, import_outline=False) # pypdf used here
+                        successful_merges += 1
+                        status_callback(f"Appended PDF: {base_filename}")
+                    except pypdf.errors.PdfReadError as read_err: # pypdf used here
+                        status_callback(f"Skipping invalid/corrupted PDF: {base_filename}. Error: {read_err}")
+                        files_skipped +=1
+                        continue
+                    except FileNotFoundError:
+                        raise # Reported as "File not found" below
+                    except Exception as append_err:
+                        status_callback(f"Error appending PDF {base_filename}: {append_err}. Skipping.")
+                        files_skipped += 1
+                        continue
+                else: 
+                    status_callback(f"Skipping unsupported file type: {base_filename}")
                     files_skipped += 1
                     continue
-            else: 
-                status_callback(f"Skipping unsupported file type: {base_filename}")
+            except FileNotFoundError:
+                status_callback(f"File not found during merge: {base_filename}. Skipping.")
                 files_skipped += 1
-                continue
-        except FileNotFoundError:
-            status_callback(f"File not found during merge: {base_filename}. Skipping.")
-            files_skipped += 1
-        except Image.UnidentifiedImageError: # PIL.Image used here
-            status_callback(f"Cannot identify or open image file: {base_filename}. Skipping.")
-            files_skipped += 1
-        except Exception as e:
-            status_callback(f"Error processing file {base_filename}: {e}. Skipping.")
-            files_skipped += 1
-        progress_callback(i + 1, total_files)
+            except Image.UnidentifiedImageError: # PIL.Image used here
+                status_callback(f"Cannot identify or open image file: {base_filename}. Skipping.")
+                files_skipped += 1
+            except Exception as e:
+                status_callback(f"Error processing file {base_filename}: {e}. Skipping.")
+                files_skipped += 1
+            progress_callback(files_done, total_files)
 
-    if successful_merges == 0 or not writer.pages:
-        if files_skipped == total_files and total_files > 0:
-             messagebox.showerror("Error", "All selected files were skipped due to errors or being invalid.")
-        else:
-            messagebox.showerror("Error", "No valid pages could be extracted or converted from the selected files.")
-        status_callback("Merging failed: No valid content merged.")
-        return False
+        if cancelled: # The finally below shuts the pools down and releases the sources
+            status_callback("Merging cancelled.")
+            return False
 
-    try:
-        with open(output_path, "wb") as output_pdf:
-            writer.write(output_pdf)
-        final_msg = f"Merging complete. Output: {os.path.basename(output_path)}"
-        if files_skipped > 0:
-            final_msg += f" ({files_skipped} file(s) skipped)."
-        status_callback(final_msg)
-        return True
-    except Exception as e:
-        messagebox.showerror("Error", f"An error occurred while saving the merged PDF:\n{e}")
-        status_callback(f"Error saving merged PDF: {e}")
-        return False
+        if successful_merges == 0 or not writer.pages:
+            status_callback("Merging failed: No valid content merged.")
+            if files_skipped == total_files and total_files > 0:
+                raise ProcessingError("All selected files were skipped due to errors or being invalid.")
+            raise ProcessingError("No valid pages could be extracted or converted from the selected files.")
+
+        # Saved under a temporary name next to the output and then renamed over it, so a failed
+        # save never leaves a truncated PDF behind (or destroys an existing file of that name)
+        partial_path = os.path.join(os.path.dirname(os.path.abspath(output_path)), f".{os.path.basename(output_path)}.part")
+        try:
+            if use_pikepdf:
+                writer.save(partial_path) # pikepdf used here
+            else:
+                with open(partial_path, "wb", buffering=WRITE_BUFFER_SIZE) as output_pdf:
+                    writer.write(output_pdf)
+            os.replace(partial_path, output_path)
+            final_msg = f"Merging complete. Output: {os.path.basename(output_path)}"
+            if files_skipped > 0:
+                final_msg += f" ({files_skipped} file(s) skipped)."
+            status_callback(final_msg)
+            return True
+        except Exception as e:
+            with contextlib.suppress(OSError):
+                os.remove(partial_path)
+            status_callback(f"Error saving merged PDF: {e}")
+            raise ProcessingError(f"An error occurred while saving the merged PDF:\n{e}") from e
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        read_pool.shutdown(wait=False, cancel_futures=True)
+        release_sources()
 
 # --- GUI Class ---
 class PdfUtilityApp:
@@ -347,13 +1063,63 @@ class PdfUtilityApp:
         self.mode = tk.StringVar(value="split")
         self.input_path = tk.StringVar()
         self._selected_merge_files = []
+        self._selected_merge_label = None # "N file(s) selected", as shown in the input entry for _selected_merge_files
+        self.input_path.trace_add("write", self._on_input_path_changed)
         self.output_path = tk.StringVar()
         self.split_output_type = tk.StringVar(value="pdf")
         self.image_format = tk.StringVar(value="PNG")
+        self.image_dpi = tk.StringVar(value=str(IMAGE_DPI))
+
+        # Latest status/progress posted by the worker thread. The callbacks only store
+        # into these slots; _flush_ui applies them on the Tk thread at UI_REFRESH_MS.
+        self._ui_lock = threading.Lock()
+        self._status_pending = None
+        self._progress_pending = None
+        self._warning_pending = None # (title, message) raised by the worker, shown from the Tk thread
+        self._status_shown = None # Text last put on status_label, so an unchanged message isn't re-laid out
+        self._percent_posted = None # (maximum, whole percent) last posted, so per-page calls that don't move the bar are dropped
+
+        # One long-lived worker thread serves every job, instead of a new thread per click.
+        # _flush_ui also notices when the running job's future is done, so the worker
+        # never has to call into Tk, not even root.after.
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdfworker")
+        self._current_future = None
+        self._backends_future = None # The load_backends job; no job may run if it failed
+        self._backends_reported = False # Set once _flush_ui has seen the imports finish
+        # Set by the Cancel button; the backends check it between pages/ranges/files and return early
+        self._cancel_event = threading.Event()
+        self._about_win = None # Built on first use, then hidden and shown again
 
         self._create_widgets()
         self._layout_widgets() 
         self._update_ui_for_mode()
+        self.root.after(UI_REFRESH_MS, self._flush_ui)
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def load_backends_in_background(self):
+        # The worker runs one job at a time in submission order, so any job started
+        # later only runs once the imports are done; the window doesn't wait for them.
+        self._backends_future = self._executor.submit(load_backends)
+
+    def _backends_failure(self):
+        """
+        Returns the user-facing message if load_backends raised, else None (also while it is
+        still running). A job that got past the dependency check would otherwise fail with a
+        NameError for the library that never got imported.
+        """
+        future = self._backends_future
+        if future is None or not future.done() or future.cancelled() or future.exception() is None:
+            return None
+        exc = future.exception()
+        return ("The PDF libraries could not be loaded, so no files can be processed.\n"
+                "Reinstall them and restart the application.\n\n"
+                f"Details: {type(exc).__name__}: {exc}")
+
+    def _on_close(self):
+        # Drop queued jobs and ask a running one to stop at its next checkpoint.
+        self._cancel_event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
 
     def _create_widgets(self):
         self.mode_about_frame = ttk.Frame(self.root)
@@ -379,8 +1145,12 @@ class PdfUtilityApp:
         self.split_image_radio = ttk.Radiobutton(self.split_options_frame, text="Output as Images", variable=self.split_output_type, value="image", command=self._toggle_image_format_combo)
         self.image_format_label = ttk.Label(self.split_options_frame, text="Image Format:")
         self.image_format_combo = ttk.Combobox(self.split_options_frame, textvariable=self.image_format, values=["PNG", "JPG"], state='readonly', width=7)
+        self.image_dpi_label = ttk.Label(self.split_options_frame, text="DPI:")
+        self.image_dpi_combo = ttk.Combobox(self.split_options_frame, textvariable=self.image_dpi, values=["72", "100", "150", "200", "300"], state='readonly', width=5)
 
-        self.action_button = ttk.Button(self.root, text="Start Processing", command=self._start_processing_thread, width=20)
+        self.action_frame = ttk.Frame(self.root)
+        self.action_button = ttk.Button(self.action_frame, text="Start Processing", command=self._start_processing_thread, width=20)
+        self.cancel_button = ttk.Button(self.action_frame, text="Cancel", command=self._cancel_processing, width=10, state='disabled')
 
         self.status_frame = ttk.LabelFrame(self.root, text="Status")
         self.status_label = ttk.Label(self.status_frame, text="Ready.", anchor="w", justify="left", wraplength=550)
@@ -409,6 +1179,11 @@ class PdfUtilityApp:
         self.split_image_radio.grid(row=0, column=1, padx=5, pady=5, sticky="w")
         self.image_format_label.grid(row=1, column=0, padx=5, pady=5, sticky="w")
         self.image_format_combo.grid(row=1, column=1, padx=5, pady=5, sticky="w")
+        self.image_dpi_label.grid(row=1, column=2, padx=5, pady=5, sticky="w")
+        self.image_dpi_combo.grid(row=1, column=3, padx=5, pady=5, sticky="w")
+
+        self.action_button.pack(side="left", padx=5)
+        self.cancel_button.pack(side="left", padx=5)
 
         self.status_label.pack(pady=(5,0), padx=5, fill="x")
         self.progress_bar.pack(pady=5, padx=5, fill="x")
@@ -416,13 +1191,13 @@ class PdfUtilityApp:
 
     def _layout_dynamic_elements(self):
         self.split_options_frame.pack_forget()
-        self.action_button.pack_forget()
+        self.action_frame.pack_forget()
         self.status_frame.pack_forget()
 
         if self.mode.get() == "split":
             self.split_options_frame.pack(pady=5, padx=10, fill="x")
         
-        self.action_button.pack(pady=(15, 5)) 
+        self.action_frame.pack(pady=(15, 5)) 
         self.status_frame.pack(pady=(5,10), padx=10, fill="both", expand=True)
 
     def _update_ui_for_mode(self):
@@ -435,25 +1210,22 @@ class PdfUtilityApp:
             self.input_label_text.set("Input PDF File:")
             self.output_label_text.set("Output Directory:")
             self.action_button.config(text="Start Splitting")
-            self._toggle_image_format_combo()
         elif mode == "merge":
             self.input_label_text.set("Input Files/Folder (PDF, JPG, PNG):")
             self.output_label_text.set("Output Merged PDF File:")
             self.action_button.config(text="Start Merging")
-            self.image_format_label.config(state='disabled') 
-            self.image_format_combo.config(state='disabled')
+        self._toggle_image_format_combo() # Disables the image options outside split-to-images
         
         self._layout_dynamic_elements()
         self._update_status("Ready.")
         self._update_progress(0, 1)
 
     def _toggle_image_format_combo(self):
-        if self.mode.get() == "split" and self.split_output_type.get() == "image":
-            self.image_format_label.config(state='normal')
-            self.image_format_combo.config(state='readonly')
-        else:
-            self.image_format_label.config(state='disabled')
-            self.image_format_combo.config(state='disabled')
+        enabled = self.mode.get() == "split" and self.split_output_type.get() == "image"
+        label_state, combo_state = ('normal', 'readonly') if enabled else ('disabled', 'disabled')
+        for label, combo in ((self.image_format_label, self.image_format_combo), (self.image_dpi_label, self.image_dpi_combo)):
+            label.config(state=label_state)
+            combo.config(state=combo_state)
 
     def _select_input(self):
         mode = self.mode.get()
@@ -473,8 +1245,9 @@ class PdfUtilityApp:
                 title="Select Input PDF and Image Files",
                 filetypes=[("Supported Files", "*.pdf *.jpg *.jpeg *.png"), ("PDF Files", "*.pdf"), ("Image Files", "*.jpg *.jpeg *.png"), ("All Files", "*.*")])
             if filepaths:
-                self._selected_merge_files = sorted(list(filepaths), key=natural_sort_key)
-                self.input_path.set(f"{len(self._selected_merge_files)} file(s) selected")
+                self._selected_merge_files = sorted(list(filepaths), key=_nat_key)
+                self._selected_merge_label = f"{len(self._selected_merge_files)} file(s) selected"
+                self.input_path.set(self._selected_merge_label)
                 current_output_file = self.output_path.get()
                 if self._selected_merge_files:
                     candidate_dir = os.path.dirname(self._selected_merge_files[0])
@@ -485,15 +1258,23 @@ class PdfUtilityApp:
                         messagebox.askyesno("Update Output Path?", f"Set output to '{candidate_output_file}'?")):
                         self.output_path.set(candidate_output_file)
 
+    def _on_input_path_changed(self, *_):
+        # Once the entry no longer shows the selection label (the user typed a path, or the
+        # mode was switched), the picked files no longer apply
+        if self._selected_merge_files and self.input_path.get() != self._selected_merge_label:
+            self._selected_merge_files = []
+
     def _select_output(self):
         mode = self.mode.get()
         current_output_val = self.output_path.get()
         initial_dir_val = os.getcwd() 
 
+        current_output_kind = _classify(current_output_val) if current_output_val else "missing"
+
         if current_output_val:
-            if os.path.isdir(current_output_val):
+            if current_output_kind == "dir":
                 initial_dir_val = current_output_val
-            elif os.path.isfile(current_output_val): 
+            elif current_output_kind == "file": 
                 initial_dir_val = os.path.dirname(current_output_val)
             elif not os.path.dirname(current_output_val) and current_output_val: 
                  pass 
@@ -507,8 +1288,9 @@ class PdfUtilityApp:
                  initial_dir_val = os.path.dirname(self._selected_merge_files[0])
             elif self.input_path.get(): 
                 typed_input = self.input_path.get()
-                if os.path.isdir(typed_input): initial_dir_val = typed_input
-                elif os.path.isfile(typed_input): initial_dir_val = os.path.dirname(typed_input)
+                typed_input_kind = _classify(typed_input)
+                if typed_input_kind == "dir": initial_dir_val = typed_input
+                elif typed_input_kind == "file": initial_dir_val = os.path.dirname(typed_input)
         
         if not os.path.isdir(initial_dir_val):
             initial_dir_val = os.getcwd()
@@ -517,34 +1299,75 @@ class PdfUtilityApp:
             dirpath = filedialog.askdirectory(title="Select Output Directory", initialdir=initial_dir_val)
             if dirpath: self.output_path.set(dirpath)
         elif mode == "merge":
-            initial_file = os.path.basename(current_output_val) if current_output_val and not os.path.isdir(current_output_val) else "merged_output.pdf"
+            initial_file = os.path.basename(current_output_val) if current_output_val and current_output_kind != "dir" else "merged_output.pdf"
             filepath = filedialog.asksaveasfilename(
                 title="Save Merged PDF As...", initialdir=initial_dir_val, initialfile=initial_file,
                 defaultextension=".pdf", filetypes=[("PDF Files", "*.pdf")]) 
             if filepath: self.output_path.set(filepath)
 
     def _update_status(self, message):
-        self.root.after(0, self.status_label.config, {'text': message})
+        with self._ui_lock:
+            self._status_pending = message
 
     def _update_progress(self, value, maximum):
-        def do_update():
+        # Long jobs move the bar by a fraction of a pixel per page; only post an update
+        # when it moves by at least one percent (or is reset to a new range). Checked
+        # before taking the lock, so most per-page calls return straight away.
+        percent = (maximum, value * 100 // maximum if maximum > 0 else 0)
+        if percent == self._percent_posted:
+            return
+        self._percent_posted = percent
+        with self._ui_lock:
+            self._progress_pending = (value, maximum)
+
+    def _apply_pending_ui(self):
+        """Pushes the latest pending status/progress to the widgets (Tk thread only)."""
+        with self._ui_lock:
+            status, self._status_pending = self._status_pending, None
+            progress, self._progress_pending = self._progress_pending, None
+            warning, self._warning_pending = self._warning_pending, None
+        if status is not None and status != self._status_shown:
+            self.status_label.config(text=status)
+            self._status_shown = status
+        if progress is not None:
+            value, maximum = progress
             self.progress_bar['maximum'] = maximum if maximum > 0 else 1
             self.progress_bar['value'] = value
-        self.root.after(0, do_update)
+        if warning is not None:
+            self._show_notice(*warning)
+
+    def _flush_ui(self):
+        self.root.after(UI_REFRESH_MS, self._flush_ui) # Rescheduled first so an error below can't stop the pump
+        self._apply_pending_ui()
+        if not self._backends_reported and self._backends_future is not None and self._backends_future.done():
+            self._backends_reported = True
+            failure = self._backends_failure()
+            if failure is not None:
+                exc = self._backends_future.exception()
+                traceback.print_exception(type(exc), exc, exc.__traceback__)
+                self._update_status("Error: The PDF libraries failed to load.")
+                if self._current_future is None: # Otherwise the queued job reports it when it is refused
+                    messagebox.showerror("Libraries Failed to Load", failure)
+        if self._current_future is not None and self._current_future.done():
+            future, self._current_future = self._current_future, None
+            self._task_done(future)
 
     def _processing_finished(self, success):
+        self._apply_pending_ui() # The checks below read the widgets, so bring them up to date first
         self.action_button.config(state='normal')
+        self.cancel_button.config(state='disabled')
+        # _status_shown mirrors status_label's text, so there's no need to ask Tk for it
+        final_message = self._status_shown or ""
+        final_message_lower = final_message.lower()
         if success:
-            final_message = self.status_label.cget("text") 
-            if "complete" in final_message.lower() or "output" in final_message.lower() or "merged" in final_message.lower():
+            if "complete" in final_message_lower or "output" in final_message_lower or "merged" in final_message_lower:
                  messagebox.showinfo("Success", final_message) 
                  self._update_status(final_message) 
             else: 
                  messagebox.showinfo("Success", "Processing completed successfully!")
                  self._update_status("Done. Processing completed successfully.")
         else:
-            current_status = self.status_label.cget("text")
-            if not any(err_keyword in current_status.lower() for err_keyword in ["error", "failed", "skipping", "invalid"]):
+            if not any(err_keyword in final_message_lower for err_keyword in ["error", "failed", "skipping", "invalid", "cancel"]):
                 self._update_status("Failed. See error messages shown or console for details.")
         
         if success and self.progress_bar['value'] == self.progress_bar['maximum']:
@@ -559,65 +1382,29 @@ class PdfUtilityApp:
         mode = self.mode.get()
         actual_input_source_for_processing = None
 
+        failure = self._backends_failure()
+        if failure is not None:
+            messagebox.showerror("Libraries Failed to Load", failure)
+            return
+
         if not output_target:
             messagebox.showerror("Error", f"Please select or enter an output {'directory' if mode == 'split' else 'file path'}.")
             return
 
+        # Only Tk variables are read here; validation touches the filesystem (slow on network
+        # drives), so it runs at the start of the job on the worker, in _run_job
         if mode == "split":
-            if not typed_input_path:
-                messagebox.showerror("Error", "Please select or enter an input PDF file.")
-                return
-            if not os.path.isfile(typed_input_path):
-                 messagebox.showerror("Error", f"Input PDF file not found: {typed_input_path}")
-                 return
-            if not typed_input_path.lower().endswith(".pdf"):
-                 messagebox.showerror("Error", f"Input for splitting must be a PDF file. Selected: {os.path.basename(typed_input_path)}")
-                 return
             actual_input_source_for_processing = typed_input_path
-            if not os.path.isdir(output_target):
-                try:
-                    os.makedirs(output_target, exist_ok=True)
-                    self._update_status(f"Created output directory: {output_target}")
-                except OSError as e:
-                    messagebox.showerror("Error", f"Output directory '{output_target}' is invalid and cannot be created: {e}")
-                    return
         elif mode == "merge":
-            if self._selected_merge_files and typed_input_path == f"{len(self._selected_merge_files)} file(s) selected":
-                actual_input_source_for_processing = self._selected_merge_files
-            elif typed_input_path and (os.path.isfile(typed_input_path) or os.path.isdir(typed_input_path)):
-                actual_input_source_for_processing = typed_input_path
+            if self._selected_merge_files:
+                # A copy, so the worker never shares the list with the UI that replaces it
+                actual_input_source_for_processing = list(self._selected_merge_files)
             else:
-                messagebox.showerror("Error", "Please select input files, or enter a valid input file/folder path for merging.")
-                return
-            
-            output_dir_merge = os.path.dirname(output_target)
-            if not output_target.lower().endswith(".pdf"):
-                messagebox.showerror("Error", f"Output for merging must be a PDF file (e.g., merged.pdf). Current: {output_target}")
-                return
-
-            if output_dir_merge and not os.path.isdir(output_dir_merge): 
-                try:
-                    os.makedirs(output_dir_merge, exist_ok=True)
-                    self._update_status(f"Created output directory: {output_dir_merge}")
-                except OSError as e:
-                    messagebox.showerror("Error", f"Output directory '{output_dir_merge}' for merged file does not exist and cannot be created: {e}")
-                    return
-            elif not output_dir_merge and not os.path.isdir(os.getcwd()): 
-                messagebox.showerror("Error", f"Cannot determine a valid output directory for: {output_target}")
-                return
-        
-        check_output_location = output_target if mode == "split" else os.path.dirname(output_target)
-        if not check_output_location: check_output_location = os.getcwd() 
-
-        if not os.access(check_output_location, os.W_OK):
-            messagebox.showwarning("Permission Warning", f"Application may not have write permissions for the output location: {check_output_location}\nPlease check permissions if processing fails.")
-
-        self.action_button.config(state='disabled')
-        self._update_status("Starting processing...")
-        self._update_progress(0, 1) 
+                actual_input_source_for_processing = typed_input_path
 
         args = ()
         target_func = None
+        img_format = None
 
         if mode == "split":
             split_type = self.split_output_type.get()
@@ -626,41 +1413,96 @@ class PdfUtilityApp:
                 args = (actual_input_source_for_processing, output_target, self._update_status, self._update_progress)
             elif split_type == "image":
                 target_func = split_pdf_to_images
-                args = (actual_input_source_for_processing, output_target, self.image_format.get(), self._update_status, self._update_progress)
+                img_format = self.image_format.get()
+                args = (actual_input_source_for_processing, output_target, img_format, self._update_status, self._update_progress, int(self.image_dpi.get()))
         elif mode == "merge":
             target_func = merge_pdfs
             args = (actual_input_source_for_processing, output_target, self._update_status, self._update_progress)
 
         if target_func and args:
-            processing_thread = threading.Thread(target=self._run_task, args=(target_func, args), daemon=True)
-            processing_thread.start()
+            self.action_button.config(state='disabled')
+            self._cancel_event.clear()
+            self._update_status("Starting processing...")
+            self._update_progress(0, 1) 
+            self._current_future = self._executor.submit(self._run_job, mode, target_func, args, img_format)
+            self.cancel_button.config(state='normal')
         else:
             messagebox.showerror("Error", "Invalid processing mode or options selected.")
-            self.action_button.config(state='normal')
             self._update_status("Error: Invalid mode or options.")
 
-    def _run_task(self, func, args):
-        success = False
-        try:
-            self.root.after(0, self._update_progress, (args[0], 1, 100) if func == merge_pdfs and isinstance(args[0],list) else (1,2) )
-            success = func(*args)
-        except Exception as e:
-            print(f"Critical Error in processing thread for function {func.__name__}: {e}")
-            import traceback
-            traceback.print_exc() 
-            self.root.after(0, messagebox.showerror, "Critical Background Error", f"An unexpected error occurred in the background task:\n{e}")
-            self.root.after(0, self._update_status, f"Critical Error: {e}")
-            success = False
-        finally:
-            self.root.after(0, self._processing_finished, success)
+    def _run_job(self, mode, target_func, args, img_format=None):
+        """
+        Runs on the worker thread: validates the paths (creating the output folder if needed),
+        then does the work. Validation errors are raised as ProcessingError for _task_done to show.
+        """
+        # The imports ran first on this same worker, so they have finished by now
+        failure = self._backends_failure()
+        if failure is not None:
+            raise ProcessingError(failure, title="Libraries Failed to Load")
+        input_source, output_target = args[0], args[1]
+        if mode == "split":
+            error = _validate_split_args(input_source, output_target, img_format)
+        else:
+            if isinstance(input_source, str) and (not input_source or _classify(input_source) == "missing"):
+                raise ProcessingError("Please select input files, or enter a valid input file/folder path for merging.")
+            error = _validate_merge_args(output_target)
+        if error:
+            raise ProcessingError(error)
+
+        output_location = (output_target if mode == "split" else os.path.dirname(output_target)) or os.getcwd()
+        if not os.access(output_location, os.W_OK):
+            with self._ui_lock:
+                self._warning_pending = ("Permission Warning", f"Application may not have write permissions for the output location: {output_location}\nPlease check permissions if processing fails.")
+        return target_func(*args, cancel_event=self._cancel_event)
+
+    def _cancel_processing(self):
+        self._cancel_event.set()
+        self.cancel_button.config(state='disabled')
+        self._update_status("Cancelling...")
+
+    def _task_done(self, future):
+        """Runs on the Tk thread once the worker future has finished."""
+        exc = future.exception()
+        if isinstance(exc, ProcessingError):
+            messagebox.showerror(exc.title, str(exc))
+        elif exc is not None:
+            # The status bar and dialog carry the error; stderr keeps only the traceback for debugging
+            traceback.print_exception(type(exc), exc, exc.__traceback__)
+            self._update_status(f"Critical Error: {type(exc).__name__}: {exc}")
+            messagebox.showerror("Critical Background Error", f"An unexpected error occurred in the background task:\n{exc}")
+        self._processing_finished(exc is None and bool(future.result()))
+
+    def _show_notice(self, title, message):
+        """
+        Shows a message in a plain Toplevel rather than a messagebox. It's used for warnings
+        raised while a job is still running: a messagebox runs a nested, modal event loop,
+        while this leaves the main loop (and so the progress pump) running.
+        """
+        notice_win = tk.Toplevel(self.root)
+        notice_win.title(title)
+        notice_win.resizable(False, False)
+        notice_win.transient(self.root) # No grab_set: the main window stays usable (e.g. Cancel)
+
+        main_frame = ttk.Frame(notice_win, padding="20")
+        main_frame.pack(expand=True, fill="both")
+        ttk.Label(main_frame, text=message, justify="left", wraplength=400).pack()
+        ttk.Button(main_frame, text="Close", command=notice_win.destroy).pack(pady=(10,0))
+        notice_win.geometry(f"+{self.root.winfo_x() + 50}+{self.root.winfo_y() + 50}")
 
     def _show_about_dialog(self):
-        about_win = tk.Toplevel(self.root)
+        # The dialog is built once; closing it only hides it, so reopening skips rebuilding the widgets
+        if self._about_win is not None and self._about_win.winfo_exists():
+            self._about_win.deiconify()
+            self._about_win.grab_set()
+            self._place_about_dialog()
+            return
+
+        about_win = self._about_win = tk.Toplevel(self.root)
         about_win.title(f"About {self.root.title()}")
-        about_win.geometry("400x320") 
         about_win.resizable(False, False)
         about_win.transient(self.root) 
         about_win.grab_set() 
+        about_win.protocol("WM_DELETE_WINDOW", self._hide_about_dialog)
 
         main_frame = ttk.Frame(about_win, padding="20")
         main_frame.pack(expand=True, fill="both")
@@ -682,39 +1524,41 @@ class PdfUtilityApp:
         li_label.bind("<Button-1>", lambda e: open_link(LINKEDIN_URL))
         
         ttk.Label(main_frame, text="\nA simple tool for splitting and merging PDF files,\nand converting PDF pages to images.", justify="center").pack(pady=(5,5))
-        ttk.Label(main_frame, text="Powered by PyPDF2, Pillow, and pdf2image.").pack(pady=(5,10)) 
-        
-        ttk.Button(main_frame, text="Close", command=about_win.destroy, style="Accent.TButton" if "Accent.TButton" in self.style.theme_names() else "TButton").pack(pady=(10,0)) 
+        ttk.Label(main_frame, text="Powered by pypdf, Pillow, and pdf2image.").pack(pady=(5,10)) 
         
-        about_win.update_idletasks() 
-        parent_x = self.root.winfo_x()
-        parent_y = self.root.winfo_y()
-        parent_width = self.root.winfo_width()
-        parent_height = self.root.winfo_height()
+        ttk.Button(main_frame, text="Close", command=self._hide_about_dialog, style="Accent.TButton" if "Accent.TButton" in self.style.theme_names() else "TButton").pack(pady=(10,0)) 
         
-        dialog_width = about_win.winfo_width()
-        dialog_height = about_win.winfo_height()
+        self._place_about_dialog()
+
+    def _hide_about_dialog(self):
+        self._about_win.grab_release()
+        self._about_win.withdraw()
+
+    def _place_about_dialog(self):
+        """Centres the About dialog over the main window."""
+        dialog_width, dialog_height = 400, 320
+        # The dialog has a fixed size, so there's no need to flush pending layout
+        # (update_idletasks) and query it back; size and position are set in one call.
+        parent_x, parent_y = self.root.winfo_x(), self.root.winfo_y()
+        parent_width, parent_height = self.root.winfo_width(), self.root.winfo_height()
         
         x_coordinate = parent_x + (parent_width // 2) - (dialog_width // 2)
         y_coordinate = parent_y + (parent_height // 2) - (dialog_height // 2)
         
-        about_win.geometry(f"+{x_coordinate}+{y_coordinate}")
+        self._about_win.geometry(f"{dialog_width}x{dialog_height}+{x_coordinate}+{y_coordinate}")
 
 # --- Main Application Runner ---
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Needed for the page-range worker processes in frozen builds
+
     # 1. Perform dependency check first.
     #    This will call sys.exit() if any required library is missing.
     perform_dependency_check()
 
-    # 2. If perform_dependency_check() didn't exit, it means all checked
-    #    libraries were found by the checker's temporary imports.
-    #    Now, do the *actual* imports for the application to use.
-    #    These will be available in the global scope for your functions and classes.
-    import PyPDF2
-    from PIL import Image
-    from pdf2image import convert_from_path
-
-    # 3. Now that dependencies are confirmed and imported, initialize and run the GUI.
+    # 2. If perform_dependency_check() didn't exit, all required libraries are
+    #    installed. Build and show the GUI straight away; the libraries themselves
+    #    are imported by load_backends(), queued as the worker thread's first job.
     root = tk.Tk()
     app = PdfUtilityApp(root)
+    app.load_backends_in_background()
     root.mainloop()